@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
+from sqlalchemy.orm import raiseload
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 
-from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.database import get_db, get_read_db
+from app.core.security import CurrentUser, get_current_user
 from app.models.user import User
 from app.models.deal import Deal, DealStatus, DealType
 from app.models.document import Document, DocumentStatus
@@ -51,12 +52,12 @@ class DealPipelineData(BaseModel):
 
 @router.get("/dashboard", response_model=DashboardStats)
 async def get_dashboard_stats(
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get dashboard statistics"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -166,12 +167,12 @@ async def get_dashboard_stats(
 @router.get("/performance", response_model=PerformanceMetrics)
 async def get_performance_metrics(
     period_days: int = Query(30, ge=1, le=365),
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get performance metrics for specified period"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -235,12 +236,12 @@ async def get_performance_metrics(
 
 @router.get("/pipeline", response_model=List[DealPipelineData])
 async def get_deal_pipeline(
-    current_user_id: str = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get deal pipeline data"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -250,7 +251,7 @@ async def get_deal_pipeline(
         )
     
     # Build query for active deals
-    query = select(Deal).where(
+    query = select(Deal).options(raiseload("*")).where(
         Deal.status.in_([
             DealStatus.IN_PROGRESS,
             DealStatus.DUE_DILIGENCE,
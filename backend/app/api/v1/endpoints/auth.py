@@ -13,6 +13,7 @@ from app.core.security import (
     create_access_token, 
     generate_token_pair,
     validate_password_strength,
+    CurrentUser,
     get_current_user
 )
 from app.models.user import User, UserStatus, UserRole
@@ -56,7 +57,7 @@ class UserResponse(BaseModel):
     job_title: Optional[str]
     is_active: bool
     is_verified: bool
-    created_at: str
+    created_at: datetime
 
 
 @router.post("/login", response_model=TokenResponse)
@@ -94,7 +95,7 @@ async def login(
     await db.commit()
     
     # Generate tokens
-    tokens = generate_token_pair(str(user.id), user.email)
+    tokens = generate_token_pair(user.id, user.email, user.role)
     
     return TokenResponse(
         **tokens,
@@ -151,7 +152,7 @@ async def register(
     await db.refresh(new_user)
     
     # Generate tokens
-    tokens = generate_token_pair(str(new_user.id), new_user.email)
+    tokens = generate_token_pair(new_user.id, new_user.email, new_user.role)
     
     return TokenResponse(
         **tokens,
@@ -161,12 +162,12 @@ async def register(
 
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Refresh access token"""
     # Get user from database
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user or not user.is_active:
@@ -176,7 +177,7 @@ async def refresh_token(
         )
     
     # Generate new tokens
-    tokens = generate_token_pair(str(user.id), user.email)
+    tokens = generate_token_pair(user.id, user.email, user.role)
     
     return TokenResponse(
         **tokens,
@@ -186,11 +187,11 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user information"""
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -212,12 +213,12 @@ async def logout():
 async def change_password(
     current_password: str,
     new_password: str,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Change user password"""
     # Get user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
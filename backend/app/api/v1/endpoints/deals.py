@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
-from pydantic import BaseModel
+from sqlalchemy.orm import raiseload
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 
-from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.database import get_db, get_read_db
+from app.core.security import CurrentUser, get_current_user
 from app.models.user import User, UserRole
 from app.models.deal import Deal, DealType, DealStatus
+from app.models.document import Document
 
 router = APIRouter()
 
@@ -50,11 +52,13 @@ class DealUpdate(BaseModel):
 
 
 class DealResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True)
+    
     id: int
     name: str
     description: Optional[str]
-    deal_type: str
-    status: str
+    deal_type: DealType
+    status: DealStatus
     target_company: Optional[str]
     target_industry: Optional[str]
     target_sector: Optional[str]
@@ -64,28 +68,28 @@ class DealResponse(BaseModel):
     deal_currency: str
     transaction_fee: Optional[float]
     success_fee_rate: Optional[float]
-    expected_close_date: Optional[str]
-    actual_close_date: Optional[str]
-    due_diligence_deadline: Optional[str]
+    expected_close_date: Optional[datetime]
+    actual_close_date: Optional[datetime]
+    due_diligence_deadline: Optional[datetime]
     created_by: int
     due_diligence_completed: bool
     pitchbook_generated: bool
     risk_analysis_completed: bool
     ai_processing_status: str
     processing_time: Optional[float]
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
 
 @router.post("/", response_model=DealResponse)
 async def create_deal(
     deal_data: DealCreate,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new deal"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -105,7 +109,7 @@ async def create_deal(
     await db.commit()
     await db.refresh(new_deal)
     
-    return DealResponse(**new_deal.to_dict())
+    return new_deal
 
 
 @router.get("/", response_model=List[DealResponse])
@@ -114,12 +118,12 @@ async def get_deals(
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[DealStatus] = None,
     deal_type: Optional[DealType] = None,
-    current_user_id: str = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get deals with optional filtering"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -128,8 +132,8 @@ async def get_deals(
             detail="User not found"
         )
     
-    # Build query
-    query = select(Deal)
+    # Build query (list rows never need relationships, so forbid lazy loads)
+    query = select(Deal).options(raiseload("*"))
     
     # Apply filters
     if status:
@@ -148,18 +152,18 @@ async def get_deals(
     result = await db.execute(query)
     deals = result.scalars().all()
     
-    return [DealResponse(**deal.to_dict()) for deal in deals]
+    return deals
 
 
 @router.get("/{deal_id}", response_model=DealResponse)
 async def get_deal(
     deal_id: int,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific deal by ID"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -185,19 +189,48 @@ async def get_deal(
             detail="Access denied"
         )
     
-    return DealResponse(**deal.to_dict())
+    return deal
+
+
+@router.get("/{deal_id}/documents")
+async def get_deal_documents(
+    deal_id: int,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get all documents for a deal"""
+    # Get deal
+    result = await db.execute(select(Deal.created_by).where(Deal.id == deal_id))
+    deal_created_by = result.scalar_one_or_none()
+    
+    if deal_created_by is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deal not found"
+        )
+    
+    # Check permissions
+    if not current_user.is_manager and deal_created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    # Postgres builds the JSON array; forward it without re-encoding
+    documents_json = await Document.list_as_json(db, deal_id)
+    return Response(content=documents_json, media_type="application/json")
 
 
 @router.put("/{deal_id}", response_model=DealResponse)
 async def update_deal(
     deal_id: int,
     deal_data: DealUpdate,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Update a deal"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -237,18 +270,18 @@ async def update_deal(
         result = await db.execute(select(Deal).where(Deal.id == deal_id))
         deal = result.scalar_one_or_none()
     
-    return DealResponse(**deal.to_dict())
+    return deal
 
 
 @router.delete("/{deal_id}")
 async def delete_deal(
     deal_id: int,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a deal"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -284,12 +317,12 @@ async def delete_deal(
 @router.post("/{deal_id}/start-processing")
 async def start_ai_processing(
     deal_id: int,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Start AI processing for a deal"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -334,12 +367,12 @@ async def start_ai_processing(
 @router.get("/{deal_id}/status")
 async def get_deal_status(
     deal_id: int,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get deal processing status"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
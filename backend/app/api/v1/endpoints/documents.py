@@ -1,48 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from pydantic import BaseModel
+from sqlalchemy import select, update
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
+from contextlib import suppress
+from pathlib import Path
+import hashlib
+import uuid
 
-from app.core.database import get_db
-from app.core.security import get_current_user
+import aiofiles
+import aiofiles.os
+
+from app.core.config import settings
+from app.core.database import get_db, get_read_db, rows_to_dicts
+from app.core.security import (
+    CurrentUser,
+    get_current_user,
+    sanitize_filename,
+    validate_file_type,
+    validate_file_size
+)
 from app.models.user import User
 from app.models.document import Document, DocumentType, DocumentStatus
 
 router = APIRouter()
 
+# Uploads are read and written 1 MiB at a time
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Stored names are "<32 hex uuid>_<sanitized name>" and must fit Document.filename
+_FILENAME_MAX = Document.__table__.c.filename.type.length
+_STORED_NAME_MAX = _FILENAME_MAX - 33
+
 
 class DocumentResponse(BaseModel):
     id: int
     filename: str
-    file_type: str
+    original_filename: str
     file_size: int
-    status: str
-    document_type: str
-    uploaded_by: int
+    file_size_mb: float
+    content_type: str
+    document_type: DocumentType
+    status: DocumentStatus
     deal_id: Optional[int]
-    ai_analysis_completed: bool
-    ocr_completed: bool
-    nlp_completed: bool
-    risk_flags: Optional[dict]
-    extracted_data: Optional[dict]
+    uploaded_by: int
+    processing_started: Optional[datetime]
+    processing_completed: Optional[datetime]
     processing_time: Optional[float]
-    created_at: str
-    updated_at: str
+    processing_score: Optional[float]
+    ocr_confidence: Optional[float]
+    risk_score: Optional[float]
+    risk_summary: Optional[str]
+    is_processed: bool
+    is_failed: bool
+    is_financial_document: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+# Validates rows into DocumentResponse, then serializes the list to JSON bytes in pydantic-core
+_docs_adapter = TypeAdapter(List[DocumentResponse])
 
 
 @router.post("/upload")
 async def upload_document(
     file: UploadFile = File(...),
-    deal_id: Optional[int] = None,
+    deal_id: int = Query(...),
     document_type: DocumentType = DocumentType.OTHER,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Upload a document for processing"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -51,23 +82,66 @@ async def upload_document(
             detail="User not found"
         )
     
-    # TODO: Save file to storage and create document record
-    # For now, create a mock document record
-    new_document = Document(
-        filename=file.filename,
-        file_type=file.content_type or "application/octet-stream",
-        file_size=0,  # Would be actual file size
-        document_type=document_type,
-        uploaded_by=user.id,
-        deal_id=deal_id,
-        status=DocumentStatus.UPLOADED
-    )
+    content_type = file.content_type or "application/octet-stream"
+    if not validate_file_type(content_type):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File type not allowed"
+        )
     
-    db.add(new_document)
-    await db.commit()
+    # Stream the upload to disk in chunks, hashing as we go, so memory stays
+    # flat and the event loop is never blocked on one large read
+    client_name = file.filename or "upload"
+    original_filename = client_name[:_FILENAME_MAX]
+    # Keep the tail of long names so the extension survives truncation
+    stored_name = f"{uuid.uuid4().hex}_{sanitize_filename(client_name[-_STORED_NAME_MAX:])}"
+    file_path = Path(settings.UPLOAD_DIR) / stored_name
+    file_size = 0
+    hasher = hashlib.sha256()
+    
+    async with aiofiles.open(file_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            file_size += len(chunk)
+            if not validate_file_size(file_size):
+                break
+            hasher.update(chunk)
+            await f.write(chunk)
+    
+    if not validate_file_size(file_size):
+        await aiofiles.os.remove(file_path)
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File too large"
+        )
+    
+    # Don't leave an orphaned file behind when the row can't be saved
+    try:
+        new_document = Document(
+            filename=stored_name,
+            original_filename=original_filename,
+            file_path=str(file_path),
+            file_size=file_size,
+            file_hash=hasher.hexdigest(),
+            content_type=content_type,
+            document_type=document_type,
+            uploaded_by=user.id,
+            deal_id=deal_id,
+            status=DocumentStatus.UPLOADED
+        )
+        db.add(new_document)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        await aiofiles.os.remove(file_path)
+        raise
     await db.refresh(new_document)
     
-    return {"message": "Document uploaded successfully", "document_id": new_document.id}
+    return {
+        "message": "Document uploaded successfully",
+        "document_id": new_document.id,
+        "file_size": new_document.file_size,
+        "file_hash": new_document.file_hash
+    }
 
 
 @router.get("/", response_model=List[DocumentResponse])
@@ -77,12 +151,12 @@ async def get_documents(
     deal_id: Optional[int] = None,
     document_type: Optional[DocumentType] = None,
     status: Optional[DocumentStatus] = None,
-    current_user_id: str = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get documents with optional filtering"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -91,8 +165,8 @@ async def get_documents(
             detail="User not found"
         )
     
-    # Build query
-    query = select(Document)
+    # Build query (plain columns keyed like DocumentResponse, no ORM hydration)
+    query = select(*Document.list_columns())
     
     # Apply filters
     if deal_id:
@@ -106,25 +180,25 @@ async def get_documents(
     if not user.is_manager:
         query = query.where(Document.uploaded_by == user.id)
     
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
+    # Apply pagination (same id order as Document.list_as_json)
+    query = query.order_by(Document.id).offset(skip).limit(limit)
     
     # Execute query
     result = await db.execute(query)
-    documents = result.scalars().all()
     
-    return [DocumentResponse(**doc.to_dict()) for doc in documents]
+    rows = _docs_adapter.validate_python(rows_to_dicts(result))
+    return Response(_docs_adapter.dump_json(rows), media_type="application/json")
 
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: int,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific document by ID"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -156,12 +230,12 @@ async def get_document(
 @router.post("/{document_id}/process")
 async def process_document(
     document_id: int,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Start AI processing for a document"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -206,12 +280,12 @@ async def process_document(
 @router.delete("/{document_id}")
 async def delete_document(
     document_id: int,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a document"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -237,8 +311,12 @@ async def delete_document(
             detail="Access denied"
         )
     
-    # Delete document
-    await db.execute(delete(Document).where(Document.id == document_id))
+    # Delete document (already loaded, so this emits a single DELETE by PK)
+    await db.delete(document)
     await db.commit()
     
+    # Remove the stored file only once the row is gone
+    with suppress(FileNotFoundError):
+        await aiofiles.os.remove(document.file_path)
+    
     return {"message": "Document deleted successfully"}
\ No newline at end of file
@@ -1,18 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
+from sqlalchemy.orm import selectinload, raiseload
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import CurrentUser, get_current_user
 from app.models.user import User
 from app.models.deal import Deal
 from app.models.document import Document
 
 router = APIRouter()
 
+# Timestamp reused by mock responses until real persistence lands
+_STARTUP_ISO = datetime.utcnow().isoformat()
+
 
 class DueDiligenceRequest(BaseModel):
     deal_id: int
@@ -48,15 +52,51 @@ class RiskAssessment(BaseModel):
     mitigation_strategies: List[str]
 
 
+def _mock_reports(deal_id: int) -> List[DueDiligenceReport]:
+    """Build mock due diligence reports for a deal"""
+    return [
+        DueDiligenceReport(
+            id=f"dd_{deal_id}_001",
+            deal_id=deal_id,
+            status="completed",
+            analysis_type="comprehensive",
+            risk_score=72.5,
+            risk_level="medium",
+            key_findings=[
+                {"category": "Financial", "finding": "Strong revenue growth", "impact": "positive"},
+                {"category": "Legal", "finding": "Pending litigation", "impact": "negative"},
+                {"category": "Operational", "finding": "Efficient operations", "impact": "positive"}
+            ],
+            financial_analysis={
+                "revenue": {"value": 50000000, "growth_rate": 0.15, "trend": "positive"},
+                "ebitda": {"value": 12000000, "margin": 0.24, "trend": "stable"},
+                "debt": {"value": 8000000, "debt_to_equity": 0.4, "trend": "decreasing"}
+            },
+            risk_flags=[
+                {"type": "legal", "severity": "medium", "description": "Ongoing IP dispute"},
+                {"type": "financial", "severity": "low", "description": "Customer concentration risk"}
+            ],
+            recommendations=[
+                "Negotiate escrow for pending litigation",
+                "Diversify customer base post-acquisition",
+                "Implement enhanced financial controls"
+            ],
+            processing_time=1247.5,
+            created_at=_STARTUP_ISO,
+            completed_at=_STARTUP_ISO
+        )
+    ]
+
+
 @router.post("/analyze", response_model=Dict[str, Any])
 async def start_due_diligence_analysis(
     request: DueDiligenceRequest,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Start due diligence analysis for a deal"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -113,15 +153,48 @@ async def start_due_diligence_analysis(
     }
 
 
+@router.get("/reports", response_model=Dict[int, List[DueDiligenceReport]])
+async def get_reports_bulk(
+    deal_ids: List[int] = Query(...),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get due diligence reports for several deals in one request"""
+    # Get current user
+    result = await db.execute(select(User).where(User.id == current_user.id))
+    user = result.scalar_one_or_none()
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    # Get all requested deals in one query, batching their documents
+    result = await db.execute(
+        select(Deal)
+        .where(Deal.id.in_(deal_ids))
+        .options(selectinload(Deal.documents), raiseload("*"))
+    )
+    deals = result.scalars().all()
+    
+    # Check permissions in memory; inaccessible deals are omitted
+    return {
+        deal.id: _mock_reports(deal.id)
+        for deal in deals
+        if user.can_access_deal(deal.created_by)
+    }
+
+
 @router.get("/reports/{deal_id}", response_model=List[DueDiligenceReport])
 async def get_due_diligence_reports(
     deal_id: int,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get due diligence reports for a deal"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -148,51 +221,18 @@ async def get_due_diligence_reports(
         )
     
     # Mock reports for now
-    mock_reports = [
-        DueDiligenceReport(
-            id=f"dd_{deal_id}_001",
-            deal_id=deal_id,
-            status="completed",
-            analysis_type="comprehensive",
-            risk_score=72.5,
-            risk_level="medium",
-            key_findings=[
-                {"category": "Financial", "finding": "Strong revenue growth", "impact": "positive"},
-                {"category": "Legal", "finding": "Pending litigation", "impact": "negative"},
-                {"category": "Operational", "finding": "Efficient operations", "impact": "positive"}
-            ],
-            financial_analysis={
-                "revenue": {"value": 50000000, "growth_rate": 0.15, "trend": "positive"},
-                "ebitda": {"value": 12000000, "margin": 0.24, "trend": "stable"},
-                "debt": {"value": 8000000, "debt_to_equity": 0.4, "trend": "decreasing"}
-            },
-            risk_flags=[
-                {"type": "legal", "severity": "medium", "description": "Ongoing IP dispute"},
-                {"type": "financial", "severity": "low", "description": "Customer concentration risk"}
-            ],
-            recommendations=[
-                "Negotiate escrow for pending litigation",
-                "Diversify customer base post-acquisition",
-                "Implement enhanced financial controls"
-            ],
-            processing_time=1247.5,
-            created_at=datetime.utcnow().isoformat(),
-            completed_at=datetime.utcnow().isoformat()
-        )
-    ]
-    
-    return mock_reports
+    return _mock_reports(deal_id)
 
 
 @router.get("/risk-assessment/{deal_id}", response_model=RiskAssessment)
 async def get_risk_assessment(
     deal_id: int,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get risk assessment for a deal"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -246,12 +286,12 @@ async def get_risk_assessment(
 @router.get("/analysis/{analysis_id}/status")
 async def get_analysis_status(
     analysis_id: str,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get status of due diligence analysis"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -269,7 +309,7 @@ async def get_analysis_status(
         "estimated_time_remaining": 0,
         "documents_processed": 5,
         "total_documents": 5,
-        "last_updated": datetime.utcnow().isoformat()
+        "last_updated": _STARTUP_ISO
     }
 
 
@@ -277,12 +317,12 @@ async def get_analysis_status(
 async def generate_due_diligence_report(
     deal_id: int,
     template: str = "standard",  # standard, comprehensive, executive
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Generate due diligence report"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -1,17 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
+from sqlalchemy.orm import raiseload
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 from app.core.database import get_db
-from app.core.security import get_current_user
+from app.core.security import CurrentUser, get_current_user
 from app.models.user import User
 from app.models.deal import Deal
 
 router = APIRouter()
 
+# Timestamp reused by mock responses until real persistence lands
+_STARTUP_ISO = datetime.utcnow().isoformat()
+
 
 class PitchbookRequest(BaseModel):
     deal_id: int
@@ -66,12 +70,12 @@ class PitchbookTemplate(BaseModel):
 @router.post("/generate", response_model=Dict[str, Any])
 async def generate_pitchbook(
     request: PitchbookRequest,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Generate a pitchbook for a deal"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -127,12 +131,12 @@ async def get_pitchbooks(
     limit: int = Query(100, ge=1, le=1000),
     deal_id: Optional[int] = None,
     status: Optional[str] = None,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get pitchbooks"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -145,7 +149,7 @@ async def get_pitchbooks(
     mock_pitchbooks = []
     
     # Get deals the user can access
-    deals_query = select(Deal)
+    deals_query = select(Deal).options(raiseload("*"))
     if not user.is_manager:
         deals_query = deals_query.where(Deal.created_by == user.id)
     
@@ -177,12 +181,12 @@ async def get_pitchbooks(
 @router.get("/{pitchbook_id}", response_model=PitchbookResponse)
 async def get_pitchbook(
     pitchbook_id: str,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific pitchbook"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -235,12 +239,12 @@ async def get_pitchbook(
 @router.get("/{pitchbook_id}/slides", response_model=List[SlideContent])
 async def get_pitchbook_slides(
     pitchbook_id: str,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get slides for a pitchbook"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
@@ -298,7 +302,7 @@ async def get_pitchbook_slides(
 @router.get("/templates", response_model=List[PitchbookTemplate])
 async def get_pitchbook_templates(
     category: Optional[str] = None,
-    current_user_id: str = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get available pitchbook templates"""
     # Mock templates
@@ -344,7 +348,7 @@ async def get_pitchbook_templates(
 @router.get("/{pitchbook_id}/status")
 async def get_pitchbook_status(
     pitchbook_id: str,
-    current_user_id: str = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get pitchbook generation status"""
     # Mock status
@@ -356,19 +360,19 @@ async def get_pitchbook_status(
         "slides_completed": 15,
         "total_slides": 15,
         "estimated_time_remaining": 0,
-        "last_updated": datetime.utcnow().isoformat()
+        "last_updated": _STARTUP_ISO
     }
 
 
 @router.delete("/{pitchbook_id}")
 async def delete_pitchbook(
     pitchbook_id: str,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a pitchbook"""
     # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
+    result = await db.execute(select(User).where(User.id == current_user.id))
     user = result.scalar_one_or_none()
     
     if not user:
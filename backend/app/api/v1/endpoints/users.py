@@ -1,29 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from pydantic import BaseModel
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncResult
+from sqlalchemy import select, update
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, AsyncIterator
+from datetime import datetime
+import orjson
 
-from app.core.database import get_db
-from app.core.security import get_current_user
-from app.models.user import User, UserRole, UserStatus
+from app.core.cache import SEL_USER_BY_ID, get_user_cached, invalidate_user_cache
+from app.core.database import get_db, get_read_db
+from app.core.security import CurrentUser, get_current_user
+from app.models.user import User, UserRole, UserStatus, UserView
 
 router = APIRouter()
 
 
 class UserResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     id: int
     email: str
     username: str
     first_name: Optional[str]
     last_name: Optional[str]
-    role: str
-    status: str
+    role: UserRole
+    status: UserStatus
     company_name: Optional[str]
     job_title: Optional[str]
     is_active: bool
     is_verified: bool
-    created_at: str
+    created_at: datetime
 
 
 class UserUpdate(BaseModel):
@@ -36,85 +42,99 @@ class UserUpdate(BaseModel):
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_profile(
-    current_user_id: str = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get current user profile"""
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
-    user = result.scalar_one_or_none()
+    profile = await get_user_cached(db, current_user.id)
     
-    if not user:
+    if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    return UserResponse(**user.to_dict())
+    # Let clients revalidate with If-None-Match and skip the body when unchanged
+    updated_at = int(datetime.fromisoformat(profile["updated_at"]).timestamp())
+    etag = f'W/"{profile["id"]}-{updated_at}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, max-age=30"
+    return profile
 
 
 @router.put("/me", response_model=UserResponse)
 async def update_current_user_profile(
     user_data: UserUpdate,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Update current user profile"""
-    # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    # Update user
     update_data = user_data.dict(exclude_unset=True)
     if update_data:
-        await db.execute(
+        # Update and fetch the row in a single UPDATE ... RETURNING
+        result = await db.execute(
             update(User)
-            .where(User.id == int(current_user_id))
+            .where(User.id == current_user.id)
             .values(**update_data)
+            .returning(User)
+            .execution_options(synchronize_session=False)
         )
+        user = result.scalar_one_or_none()
         await db.commit()
-        
-        # Get updated user
-        result = await db.execute(select(User).where(User.id == int(current_user_id)))
+        await invalidate_user_cache(current_user.id)
+    else:
+        result = await db.execute(SEL_USER_BY_ID, {"uid": current_user.id})
         user = result.scalar_one_or_none()
     
-    return UserResponse(**user.to_dict())
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    # Encode the view directly; the row is already trusted, so skip pydantic
+    return Response(orjson.dumps(UserView.from_orm(user)), media_type="application/json")
+
+
+# Rows fetched from the cursor per chunk when streaming the user list
+_USER_STREAM_BATCH = 100
+
+
+async def _iter_users_json(result: AsyncResult) -> AsyncIterator[bytes]:
+    """Encode streamed user rows as a JSON array, one batch at a time"""
+    yield b"["
+    first = True
+    async for rows in result.partitions(_USER_STREAM_BATCH):
+        chunk = b",".join(orjson.dumps(UserView.from_row(row)) for row in rows)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]"
 
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
-    skip: int = Query(0, ge=0),
+    after_id: Optional[int] = Query(None, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     role: Optional[UserRole] = None,
     status: Optional[UserStatus] = None,
-    current_user_id: str = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get users (admin/manager only)"""
-    # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    # Check permissions
-    if not user.is_manager:
+    # Check permissions (role comes from the token, no lookup needed)
+    if not current_user.is_manager:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
     
-    # Build query
-    query = select(User)
+    # Build query (only the columns UserResponse needs, read into UserView)
+    query = select(*UserView.columns())
     
     # Apply filters
     if role:
@@ -122,48 +142,37 @@ async def get_users(
     if status:
         query = query.where(User.status == status)
     
-    # Apply pagination
-    query = query.offset(skip).limit(limit)
-    
-    # Execute query
-    result = await db.execute(query)
-    users = result.scalars().all()
+    # Apply keyset pagination (pass the last id of the previous page)
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    query = query.order_by(User.id).limit(limit)
     
-    return [UserResponse(**user.to_dict()) for user in users]
+    # Stream rows from the cursor and encode them as they arrive
+    result = await db.stream(query.execution_options(yield_per=_USER_STREAM_BATCH))
+    return StreamingResponse(_iter_users_json(result), media_type="application/json")
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    current_user_id: str = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific user by ID (admin/manager only)"""
-    # Get current user
-    result = await db.execute(select(User).where(User.id == int(current_user_id)))
-    current_user = result.scalar_one_or_none()
-    
-    if not current_user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    # Check permissions
-    if not current_user.is_manager and int(current_user_id) != user_id:
+    # Check permissions (role comes from the token, no lookup needed)
+    if not current_user.is_manager and current_user.id != user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
     
     # Get target user
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    profile = await get_user_cached(db, user_id)
     
-    if not user:
+    if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    return UserResponse(**user.to_dict())
\ No newline at end of file
+    return profile
\ No newline at end of file
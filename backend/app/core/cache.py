@@ -0,0 +1,81 @@
+from typing import Optional
+from sqlalchemy import select, bindparam, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+from redis.exceptions import RedisError
+import orjson
+import logging
+
+from app.core.database import redis_client
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Built once at import so hot paths only bind parameters (pass {"uid": ...})
+SEL_USER_BY_ID = select(User).where(User.id == bindparam("uid"))
+
+# User profiles are cached for 10 minutes and dropped on update
+USER_PROFILE_TTL = 600
+
+# session.info key for user ids flushed as changed but not yet committed
+_DIRTY_USERS = "dirty_user_ids"
+
+
+def user_profile_key(user_id: int) -> str:
+    """Redis key for a cached user profile"""
+    return f"v1:user:{user_id}:profile"
+
+
+async def get_user_cached(db: AsyncSession, user_id: int) -> Optional[dict]:
+    """Get a user profile dict, reading through Redis (fails open to the DB)"""
+    key = user_profile_key(user_id)
+    try:
+        cached = await redis_client.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+    except RedisError as e:
+        logger.warning(f"User cache read failed: {e}")
+    
+    result = await db.execute(SEL_USER_BY_ID, {"uid": user_id})
+    user = result.scalar_one_or_none()
+    if not user:
+        return None
+    
+    payload = orjson.dumps(user.to_dict())
+    try:
+        await redis_client.set(key, payload, ex=USER_PROFILE_TTL)
+    except RedisError as e:
+        logger.warning(f"User cache write failed: {e}")
+    # Return the decoded payload so hits and misses have the same shape
+    return orjson.loads(payload)
+
+
+async def invalidate_user_cache(user_id: int) -> None:
+    """Drop a cached user profile"""
+    try:
+        await redis_client.delete(user_profile_key(user_id))
+    except RedisError as e:
+        logger.warning(f"User cache invalidation failed: {e}")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dirty_users(session, flush_context):
+    """Remember which user rows this flush changed or deleted"""
+    user_ids = {obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)}
+    if user_ids:
+        session.info.setdefault(_DIRTY_USERS, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    """Drop cached profiles once their changes are committed"""
+    # Runs inside the AsyncSession greenlet, so the deletes finish before commit() returns
+    for user_id in session.info.pop(_DIRTY_USERS, ()):
+        await_only(invalidate_user_cache(user_id))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_dirty_users(session, previous_transaction):
+    """Nothing was committed, so nothing needs invalidating"""
+    session.info.pop(_DIRTY_USERS, None)
@@ -1,22 +1,43 @@
+from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, Result, String, Subquery, Text, TypeDecorator, cast, event, func, select, text
+from redis import asyncio as aioredis
 from app.core.config import settings
+from contextvars import ContextVar
+from typing import List, Optional
+from dataclasses import fields
+from functools import cache
+from operator import attrgetter
+import enum
 import logging
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _json_serializer(value) -> str:
+    """Encode JSON/JSONB column values with orjson"""
+    # Non-str keys (e.g. per-user-id maps) are stringified, as stdlib json did
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=10,
-    max_overflow=20
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    query_cache_size=1200,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
 )
 
 # Create async session factory
@@ -26,6 +47,24 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Per-request query counter, only active when SQL_QUERY_BUDGET is set (CI)
+_query_counter: ContextVar[Optional[List[int]]] = ContextVar("query_counter", default=None)
+
+if settings.SQL_QUERY_BUDGET is not None:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        counter = _query_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+# Create Redis client (connections are opened lazily on first command); short
+# timeouts so an unreachable Redis fails open quickly instead of stalling requests
+redis_client = aioredis.from_url(
+    settings.REDIS_URL,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT
+)
+
 # Create declarative base
 Base = declarative_base()
 
@@ -33,8 +72,59 @@ Base = declarative_base()
 metadata = MetaData()
 
 
+class RowView:
+    """Mixin for frozen, slotted dataclass mirrors of a model's columns
+    
+    Subclasses set ``__model__`` and name each field after a model attribute.
+    """
+    __slots__ = ()
+    
+    @classmethod
+    def columns(cls) -> tuple:
+        """Columns to select() for from_row(), in field order"""
+        return tuple(getattr(cls.__model__, f.name) for f in fields(cls))
+    
+    @classmethod
+    def from_row(cls, row):
+        """Build a view from a Core row selected with columns()"""
+        return cls(*row)
+    
+    @classmethod
+    def from_orm(cls, obj):
+        """Build a view straight from a model instance (no dict intermediate)"""
+        return cls(*_view_getter(cls)(obj))
+
+
+@cache
+def _view_getter(view: type) -> attrgetter:
+    """attrgetter reading every field of a view in one C-level call"""
+    return attrgetter(*(f.name for f in fields(view)))
+
+
+class EnumType(TypeDecorator):
+    """Store a Python Enum by value in a VARCHAR column (no Postgres ENUM type)"""
+    impl = String
+    cache_ok = True
+    
+    def __init__(self, enum_class: type[enum.Enum], length: int = 32):
+        super().__init__(length)
+        self.enum_class = enum_class
+    
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, enum.Enum):
+            return value.value
+        return value
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.enum_class(value)
+
+
 async def get_db() -> AsyncSession:
     """Dependency to get database session"""
+    counter = [0]
+    _query_counter.set(counter)
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -44,6 +134,36 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+    # Fail loudly so an N+1 regression breaks the CI run (only reached when the request succeeded)
+    if settings.SQL_QUERY_BUDGET is not None and counter[0] > settings.SQL_QUERY_BUDGET:
+        raise AssertionError(
+            f"Request issued {counter[0]} queries, over budget of {settings.SQL_QUERY_BUDGET}"
+        )
+
+
+async def get_read_db(session: AsyncSession = Depends(get_db)) -> AsyncSession:
+    """Dependency to get a database session in a READ ONLY transaction (list endpoints)"""
+    # Begins the transaction READ ONLY (asyncpg readonly option); writes will now fail fast
+    await session.connection(execution_options={"postgresql_readonly": True})
+    return session
+
+
+def rows_to_dicts(result: Result) -> List[dict]:
+    """Zip Core result rows with their column keys into plain dicts"""
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+async def fetch_json_array(session: AsyncSession, rows: Subquery) -> str:
+    """Return the rows of a subquery (which must have an id column) as a JSON array string built by Postgres"""
+    # A subquery's ORDER BY does not bind the aggregate, so order inside json_agg
+    stmt = select(
+        cast(func.coalesce(
+            func.json_agg(aggregate_order_by(rows.table_valued(), rows.c.id)), text("'[]'::json")
+        ), Text)
+    )
+    result = await session.execute(stmt)
+    return result.scalar_one()
 
 
 async def init_db():
@@ -60,6 +180,7 @@ async def init_db():
 async def close_db():
     """Close database connections"""
     await engine.dispose()
+    await redis_client.aclose()
     logger.info("Database connections closed")
 
 
@@ -67,8 +188,8 @@ async def close_db():
 async def check_db_health() -> bool:
     """Check database connectivity"""
     try:
-        async with engine.begin() as conn:
-            await conn.execute("SELECT 1")
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -1,10 +1,12 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.config import settings
+from app.core.config import settings, ALLOWED_FILE_TYPES_SET
+from app.models.user import UserRole, MANAGER_ROLES
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,23 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class CurrentUser:
+    """Authenticated user identity decoded from the access token"""
+    id: int
+    role: UserRole
+    
+    @property
+    def is_admin(self) -> bool:
+        """Check if user is admin"""
+        return self.role == UserRole.ADMIN
+    
+    @property
+    def is_manager(self) -> bool:
+        """Check if user is manager or admin"""
+        return self.role in MANAGER_ROLES
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -49,8 +68,8 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Get current user from JWT token"""
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> CurrentUser:
+    """Get current user id and role from JWT token"""
     token = credentials.credentials
     payload = verify_token(token)
     
@@ -62,14 +81,22 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
     
     user_id: str = payload.get("sub")
-    if user_id is None:
+    role: str = payload.get("role")
+    if user_id is None or role is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return user_id
+    try:
+        return CurrentUser(id=int(user_id), role=UserRole(role))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
 
 def create_refresh_token(data: dict) -> str:
@@ -81,13 +108,15 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
-def generate_token_pair(user_id: str, email: str) -> dict:
+def generate_token_pair(user_id: int, email: str, role: UserRole) -> dict:
     """Generate access and refresh token pair"""
+    # JWT requires "sub" to be a string; get_current_user turns it back into an int
+    claims = {"sub": str(user_id), "email": email, "role": role.value}
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user_id, "email": email}, expires_delta=access_token_expires
+        data=claims, expires_delta=access_token_expires
     )
-    refresh_token = create_refresh_token(data={"sub": user_id, "email": email})
+    refresh_token = create_refresh_token(data=claims)
     
     return {
         "access_token": access_token,
@@ -125,7 +154,7 @@ def sanitize_filename(filename: str) -> str:
 
 def validate_file_type(content_type: str) -> bool:
     """Validate file type against allowed types"""
-    return content_type in settings.ALLOWED_FILE_TYPES
+    return content_type in ALLOWED_FILE_TYPES_SET
 
 
 def validate_file_size(file_size: int) -> bool:
@@ -1,11 +1,14 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
+import multiprocessing
 import uvicorn
-from app.core.config import settings
+from app.core.config import settings, ALLOWED_HOSTS_SET
 from app.api.v1.api import api_router
-from app.core.database import engine, Base
+from app.core.database import init_db, close_db, check_db_health
 from app.core.security import create_access_token
 from app.models.user import User
 from app.models.deal import Deal
@@ -18,15 +21,22 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting AIBanker API...")
     
-    # TODO: Initialize database connection
-    # For now, skip database initialization to focus on frontend
-    print("⚠️  Database initialization skipped for development")
+    # Create tables only in development; production schema is managed by migrations
+    if settings.DEBUG:
+        await init_db()
+    
+    # Open a pooled connection now so the first request doesn't pay the handshake
+    if await check_db_health():
+        print("✅ Database connection pool warmed up")
+    else:
+        print("⚠️  Database unavailable, skipping connection warm-up")
     
     print("✅ AIBanker API started successfully")
     yield
     
     # Shutdown
     print("🛑 Shutting down AIBanker API...")
+    await close_db()
 
 
 # Create FastAPI app instance
@@ -36,13 +46,14 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# Add CORS middleware
+# Add CORS middleware (origin checks are membership tests, so pass a set)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.ALLOWED_HOSTS,
+    allow_origins=ALLOWED_HOSTS_SET,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -54,6 +65,13 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS
 )
 
+# Compress larger responses; small ones like /health stay under minimum_size
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1024,
+    compresslevel=5
+)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -101,10 +119,14 @@ async def api_info():
 
 
 if __name__ == "__main__":
+    # Reload only works with a single worker, so it is limited to DEBUG
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=settings.DEBUG,
+        workers=1 if settings.DEBUG else settings.WEB_CONCURRENCY or multiprocessing.cpu_count(),
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     ) 
\ No newline at end of file
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, ForeignKey, JSON
+from sqlalchemy import Column, Integer, SmallInteger, Float, String, Boolean, DateTime, Text, Enum, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -29,6 +30,10 @@ class TemplateType(str, enum.Enum):
 class CollaborationComment(Base):
     """Comment model for team collaboration"""
     __tablename__ = "collaboration_comments"
+    __table_args__ = (
+        Index("ix_comments_mentions_gin", "mentions", postgresql_using="gin"),
+        Index("ix_comments_room_created", "deal_room_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     deal_room_id = Column(Integer, ForeignKey("deal_rooms.id"), nullable=False)
@@ -43,11 +48,11 @@ class CollaborationComment(Base):
     # Author and metadata
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     is_ai_generated = Column(Boolean, default=False, nullable=False)
-    ai_confidence = Column(Integer, nullable=True)  # 0-100 confidence score
+    ai_confidence = Column(SmallInteger, nullable=True)  # 0-100 confidence score
     
     # Collaboration features
-    mentions = Column(JSON, nullable=True)  # List of mentioned user IDs
-    tags = Column(JSON, nullable=True)  # Custom tags
+    mentions = Column(JSONB, nullable=True)  # List of mentioned user IDs
+    tags = Column(JSONB, nullable=True)  # Custom tags
     is_resolved = Column(Boolean, default=False, nullable=False)
     resolved_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     resolved_at = Column(DateTime, nullable=True)
@@ -57,37 +62,15 @@ class CollaborationComment(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    deal_room = relationship("DealRoom")
-    document = relationship("Document")
-    task = relationship("DealRoomTask")
-    author = relationship("User")
+    deal_room = relationship("DealRoom", lazy="selectin")
+    document = relationship("Document", lazy="selectin")
+    task = relationship("DealRoomTask", lazy="selectin")
+    author = relationship("User", foreign_keys=[author_id], lazy="selectin")
     parent_comment = relationship("CollaborationComment", remote_side=[id])
     child_comments = relationship("CollaborationComment")
     
     def __repr__(self):
         return f"<CollaborationComment(id={self.id}, type='{self.comment_type}', author_id={self.author_id})>"
-    
-    def to_dict(self) -> dict:
-        """Convert comment to dictionary"""
-        return {
-            "id": self.id,
-            "deal_room_id": self.deal_room_id,
-            "document_id": self.document_id,
-            "task_id": self.task_id,
-            "content": self.content,
-            "comment_type": self.comment_type.value,
-            "parent_comment_id": self.parent_comment_id,
-            "author_id": self.author_id,
-            "is_ai_generated": self.is_ai_generated,
-            "ai_confidence": self.ai_confidence,
-            "mentions": self.mentions,
-            "tags": self.tags,
-            "is_resolved": self.is_resolved,
-            "resolved_by": self.resolved_by,
-            "resolved_at": self.resolved_at.isoformat() if self.resolved_at else None,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
 
 
 class KnowledgeTemplate(Base):
@@ -100,9 +83,9 @@ class KnowledgeTemplate(Base):
     template_type = Column(Enum(TemplateType), nullable=False)
     
     # Template content
-    content = Column(JSON, nullable=False)  # Template structure and content
-    variables = Column(JSON, nullable=True)  # Template variables
-    validation_rules = Column(JSON, nullable=True)  # Validation rules
+    content = Column(JSONB, nullable=False)  # Template structure and content
+    variables = Column(JSONB, nullable=True)  # Template variables
+    validation_rules = Column(JSONB, nullable=True)  # Validation rules
     
     # Usage and sharing
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -112,11 +95,11 @@ class KnowledgeTemplate(Base):
     
     # Usage statistics
     usage_count = Column(Integer, default=0, nullable=False)
-    success_rate = Column(Integer, nullable=True)  # 0-100 success rate
-    average_rating = Column(Integer, nullable=True)  # 1-5 rating
+    success_rate = Column(SmallInteger, nullable=True)  # 0-100 success rate
+    average_rating = Column(SmallInteger, nullable=True)  # 1-5 rating
     
     # Tags and categorization
-    tags = Column(JSON, nullable=True)
+    tags = Column(JSONB, nullable=True)
     industry = Column(String(100), nullable=True)
     deal_type = Column(String(100), nullable=True)
     
@@ -125,33 +108,10 @@ class KnowledgeTemplate(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    creator = relationship("User")
+    creator = relationship("User", foreign_keys=[created_by], lazy="selectin")
     
     def __repr__(self):
         return f"<KnowledgeTemplate(id={self.id}, name='{self.name}', type='{self.template_type}')>"
-    
-    def to_dict(self) -> dict:
-        """Convert template to dictionary"""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "template_type": self.template_type.value,
-            "content": self.content,
-            "variables": self.variables,
-            "created_by": self.created_by,
-            "company_id": self.company_id,
-            "is_public": self.is_public,
-            "is_approved": self.is_approved,
-            "usage_count": self.usage_count,
-            "success_rate": self.success_rate,
-            "average_rating": self.average_rating,
-            "tags": self.tags,
-            "industry": self.industry,
-            "deal_type": self.deal_type,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
 
 
 class Benchmark(Base):
@@ -164,7 +124,7 @@ class Benchmark(Base):
     
     # Benchmark data
     metric_name = Column(String(100), nullable=False)
-    metric_value = Column(Integer, nullable=False)
+    metric_value = Column(Float, nullable=False)
     metric_unit = Column(String(50), nullable=True)
     
     # Context
@@ -177,7 +137,7 @@ class Benchmark(Base):
     source_deal_id = Column(Integer, ForeignKey("deals.id"), nullable=True)
     source_company_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     is_aggregated = Column(Boolean, default=False, nullable=False)  # Individual vs aggregated
-    confidence_level = Column(Integer, nullable=True)  # 0-100 confidence
+    confidence_level = Column(SmallInteger, nullable=True)  # 0-100 confidence
     
     # Usage
     usage_count = Column(Integer, default=0, nullable=False)
@@ -188,7 +148,7 @@ class Benchmark(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    source_deal = relationship("Deal")
+    source_deal = relationship("Deal", lazy="selectin")
     source_company = relationship("User")
     
     def __repr__(self):
@@ -212,15 +172,18 @@ class Benchmark(Base):
             "is_aggregated": self.is_aggregated,
             "confidence_level": self.confidence_level,
             "usage_count": self.usage_count,
-            "last_used": self.last_used.isoformat() if self.last_used else None,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
+            "last_used": self.last_used,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
         }
 
 
 class LearningInsight(Base):
     """Learning insight model for continuous improvement"""
     __tablename__ = "learning_insights"
+    __table_args__ = (
+        Index("ix_learning_insights_shared_companies_gin", "shared_companies", postgresql_using="gin"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -228,9 +191,9 @@ class LearningInsight(Base):
     insight_type = Column(String(100), nullable=False)  # process, performance, ai, client
     
     # Insight data
-    data = Column(JSON, nullable=False)  # Insight data and metrics
-    recommendations = Column(JSON, nullable=True)  # Actionable recommendations
-    impact_score = Column(Integer, nullable=True)  # 0-100 impact score
+    data = Column(JSONB, nullable=False)  # Insight data and metrics
+    recommendations = Column(JSONB, nullable=True)  # Actionable recommendations
+    impact_score = Column(SmallInteger, nullable=True)  # 0-100 impact score
     
     # Source and context
     source_deal_room_id = Column(Integer, ForeignKey("deal_rooms.id"), nullable=True)
@@ -240,12 +203,12 @@ class LearningInsight(Base):
     # Usage and feedback
     is_implemented = Column(Boolean, default=False, nullable=False)
     implementation_date = Column(DateTime, nullable=True)
-    implementation_results = Column(JSON, nullable=True)
+    implementation_results = Column(JSONB, nullable=True)
     
     # Sharing and collaboration
     is_shared = Column(Boolean, default=False, nullable=False)
-    shared_companies = Column(JSON, nullable=True)  # List of company IDs
-    feedback = Column(JSON, nullable=True)  # Feedback from other companies
+    shared_companies = Column(JSONB, nullable=True)  # List of company IDs
+    feedback = Column(JSONB, nullable=True)  # Feedback from other companies
     
     # Timestamps
     created_at = Column(DateTime, default=func.now(), nullable=False)
@@ -257,29 +220,6 @@ class LearningInsight(Base):
     
     def __repr__(self):
         return f"<LearningInsight(id={self.id}, title='{self.title}', type='{self.insight_type}')>"
-    
-    def to_dict(self) -> dict:
-        """Convert learning insight to dictionary"""
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "insight_type": self.insight_type,
-            "data": self.data,
-            "recommendations": self.recommendations,
-            "impact_score": self.impact_score,
-            "source_deal_room_id": self.source_deal_room_id,
-            "source_company_id": self.source_company_id,
-            "is_ai_generated": self.is_ai_generated,
-            "is_implemented": self.is_implemented,
-            "implementation_date": self.implementation_date.isoformat() if self.implementation_date else None,
-            "implementation_results": self.implementation_results,
-            "is_shared": self.is_shared,
-            "shared_companies": self.shared_companies,
-            "feedback": self.feedback,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
 
 
 class NetworkEffect(Base):
@@ -291,13 +231,13 @@ class NetworkEffect(Base):
     
     # Network data
     source_company_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    target_companies = Column(JSON, nullable=True)  # List of company IDs that benefited
+    target_companies = Column(JSONB, nullable=True)  # List of company IDs that benefited
     shared_content_id = Column(Integer, nullable=True)  # ID of shared template/benchmark/insight
     
     # Impact metrics
-    adoption_rate = Column(Integer, nullable=True)  # 0-100 adoption rate
+    adoption_rate = Column(SmallInteger, nullable=True)  # 0-100 adoption rate
     time_savings = Column(Integer, nullable=True)  # Hours saved across network
-    quality_improvement = Column(Integer, nullable=True)  # 0-100 quality improvement
+    quality_improvement = Column(SmallInteger, nullable=True)  # 0-100 quality improvement
     
     # Network growth
     new_connections = Column(Integer, default=0, nullable=False)
@@ -308,7 +248,7 @@ class NetworkEffect(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    source_company = relationship("User")
+    source_company = relationship("User", lazy="selectin")
     
     def __repr__(self):
         return f"<NetworkEffect(id={self.id}, type='{self.effect_type}', source_company_id={self.source_company_id})>"
@@ -326,6 +266,6 @@ class NetworkEffect(Base):
             "quality_improvement": self.quality_improvement,
             "new_connections": self.new_connections,
             "network_size": self.network_size,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
         } 
\ No newline at end of file
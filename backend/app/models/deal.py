@@ -69,6 +69,7 @@ class Deal(Base):
     ai_processing_status = Column(String(50), default="pending", nullable=False)
     ai_processing_started = Column(DateTime, nullable=True)
     ai_processing_completed = Column(DateTime, nullable=True)
+    processing_time_seconds = Column(Float, nullable=True, index=True)  # set on completion
     ai_processing_errors = Column(Text, nullable=True)
     
     # Timestamps
@@ -76,6 +77,7 @@ class Deal(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
+    # Lazy by default; list queries use raiseload("*"), so load these explicitly
     created_by_user = relationship("User", back_populates="deals")
     documents = relationship("Document", back_populates="deal")
     due_diligence_reports = relationship("DueDiligenceReport", back_populates="deal")
@@ -94,41 +96,21 @@ class Deal(Base):
         """Check if deal is completed"""
         return self.status == DealStatus.COMPLETED
     
+    @classmethod
+    def completion_values(cls, completed_at: datetime) -> dict:
+        """Column values that mark AI processing complete in a single UPDATE"""
+        return {
+            "ai_processing_status": "completed",
+            "ai_processing_completed": completed_at,
+            "processing_time_seconds": func.extract("epoch", completed_at - cls.ai_processing_started)
+        }
+    
     @property
     def processing_time(self) -> Optional[float]:
-        """Calculate AI processing time in seconds"""
+        """Get AI processing time in seconds"""
+        if self.processing_time_seconds is not None:
+            return self.processing_time_seconds
+        # Fallback for rows completed before the column existed
         if self.ai_processing_started and self.ai_processing_completed:
             return (self.ai_processing_completed - self.ai_processing_started).total_seconds()
         return None
-    
-    def to_dict(self) -> dict:
-        """Convert deal to dictionary"""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "deal_type": self.deal_type.value,
-            "status": self.status.value,
-            "target_company": self.target_company,
-            "target_industry": self.target_industry,
-            "target_sector": self.target_sector,
-            "target_revenue": self.target_revenue,
-            "target_ebitda": self.target_ebitda,
-            "deal_value": self.deal_value,
-            "deal_currency": self.deal_currency,
-            "transaction_fee": self.transaction_fee,
-            "success_fee_rate": self.success_fee_rate,
-            "expected_close_date": self.expected_close_date.isoformat() if self.expected_close_date else None,
-            "actual_close_date": self.actual_close_date.isoformat() if self.actual_close_date else None,
-            "due_diligence_deadline": self.due_diligence_deadline.isoformat() if self.due_diligence_deadline else None,
-            "created_by": self.created_by,
-            "due_diligence_completed": self.due_diligence_completed,
-            "pitchbook_generated": self.pitchbook_generated,
-            "risk_analysis_completed": self.risk_analysis_completed,
-            "ai_processing_status": self.ai_processing_status,
-            "ai_processing_started": self.ai_processing_started.isoformat() if self.ai_processing_started else None,
-            "ai_processing_completed": self.ai_processing_completed.isoformat() if self.ai_processing_completed else None,
-            "processing_time": self.processing_time,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        } 
\ No newline at end of file
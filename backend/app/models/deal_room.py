@@ -1,10 +1,17 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, ForeignKey, JSON
+from sqlalchemy import Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Index, select, insert, and_, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
-from app.core.database import Base
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.database import Base, EnumType, fetch_json_array
 import enum
 from datetime import datetime
-from typing import Optional, List
+from typing import TYPE_CHECKING, Any, Optional, List
+
+if TYPE_CHECKING:
+    from app.models.deal import Deal
+    from app.models.document import Document
+    from app.models.user import User
 
 
 class DealRoomStatus(str, enum.Enum):
@@ -27,44 +34,53 @@ class TaskStatus(str, enum.Enum):
     BLOCKED = "blocked"
 
 
+# Statuses counted as an active deal room
+_ACTIVE_STATUSES = frozenset({
+    DealRoomStatus.ACTIVE,
+    DealRoomStatus.DUE_DILIGENCE,
+    DealRoomStatus.NEGOTIATION,
+    DealRoomStatus.CLOSING
+})
+
+
 class DealRoom(Base):
     """Deal room model for collaborative deal management"""
     __tablename__ = "deal_rooms"
     
-    id = Column(Integer, primary_key=True, index=True)
-    deal_id = Column(Integer, ForeignKey("deals.id"), nullable=False, unique=True)
-    name = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    status = Column(Enum(DealRoomStatus), default=DealRoomStatus.SETUP, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    deal_id: Mapped[int] = mapped_column(Integer, ForeignKey("deals.id"), nullable=False, unique=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    status: Mapped[DealRoomStatus] = mapped_column(EnumType(DealRoomStatus), default=DealRoomStatus.SETUP, nullable=False)
     
     # Team and collaboration
-    team_members = Column(JSON, nullable=True)  # List of user IDs and roles
-    external_contacts = Column(JSON, nullable=True)  # Client and advisor contacts
-    permissions = Column(JSON, nullable=True)  # Granular permissions per user
+    team_members: Mapped[Any] = mapped_column(JSON, nullable=True)  # List of user IDs and roles
+    team_size: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # len(team_members), kept in sync on flush
+    external_contacts: Mapped[Any] = mapped_column(JSON, nullable=True)  # Client and advisor contacts
+    permissions: Mapped[Any] = mapped_column(JSON, nullable=True)  # Granular permissions per user
     
     # Workflow tracking
-    current_phase = Column(String(100), nullable=True)
-    phase_progress = Column(Integer, default=0)  # 0-100 percentage
-    next_milestone = Column(DateTime, nullable=True)
-    last_activity = Column(DateTime, nullable=True)
+    current_phase: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    phase_progress: Mapped[Optional[int]] = mapped_column(Integer, default=0)  # 0-100 percentage
+    next_milestone: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_activity: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # AI assistance
-    ai_recommendations = Column(JSON, nullable=True)  # AI-generated suggestions
-    ai_insights = Column(JSON, nullable=True)  # Cross-deal insights
-    automation_rules = Column(JSON, nullable=True)  # Custom automation rules
-    
-    # Communication
-    comments = Column(JSON, nullable=True)  # Threaded comments
-    activity_log = Column(JSON, nullable=True)  # Activity timeline
+    ai_recommendations: Mapped[Any] = mapped_column(JSON, nullable=True)  # AI-generated suggestions
+    ai_insights: Mapped[Any] = mapped_column(JSON, nullable=True)  # Cross-deal insights
+    automation_rules: Mapped[Any] = mapped_column(JSON, nullable=True)  # Custom automation rules
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    deal = relationship("Deal", back_populates="deal_room")
-    tasks = relationship("DealRoomTask", back_populates="deal_room")
-    documents = relationship("DealRoomDocument", back_populates="deal_room")
+    deal: Mapped["Deal"] = relationship("Deal", back_populates="deal_room")
+    tasks: Mapped[List["DealRoomTask"]] = relationship("DealRoomTask", back_populates="deal_room", lazy="selectin")
+    documents: Mapped[List["DealRoomDocument"]] = relationship("DealRoomDocument", back_populates="deal_room", lazy="selectin")
+    # Comments live in CollaborationComment; the activity timeline is unbounded,
+    # so it stays lazy and is read a page at a time with DealRoomActivity.recent()
+    activities: Mapped[List["DealRoomActivity"]] = relationship("DealRoomActivity", back_populates="deal_room")
     
     def __repr__(self):
         return f"<DealRoom(id={self.id}, name='{self.name}', status='{self.status}')>"
@@ -72,15 +88,7 @@ class DealRoom(Base):
     @property
     def is_active(self) -> bool:
         """Check if deal room is active"""
-        return self.status in [DealRoomStatus.ACTIVE, DealRoomStatus.DUE_DILIGENCE, 
-                              DealRoomStatus.NEGOTIATION, DealRoomStatus.CLOSING]
-    
-    @property
-    def team_size(self) -> int:
-        """Get number of team members"""
-        if self.team_members:
-            return len(self.team_members)
-        return 0
+        return self.status in _ACTIVE_STATUSES
     
     def to_dict(self) -> dict:
         """Convert deal room to dictionary"""
@@ -89,62 +97,66 @@ class DealRoom(Base):
             "deal_id": self.deal_id,
             "name": self.name,
             "description": self.description,
-            "status": self.status.value,
+            "status": self.status,
             "current_phase": self.current_phase,
             "phase_progress": self.phase_progress,
             "team_size": self.team_size,
-            "next_milestone": self.next_milestone.isoformat() if self.next_milestone else None,
-            "last_activity": self.last_activity.isoformat() if self.last_activity else None,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
+            "next_milestone": self.next_milestone,
+            "last_activity": self.last_activity,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
         }
 
 
 class DealRoomTask(Base):
     """Task model for deal room workflow management"""
     __tablename__ = "deal_room_tasks"
+    __table_args__ = (
+        Index("ix_deal_room_tasks_room_status", "deal_room_id", "status"),
+        Index("ix_deal_room_tasks_assigned_due", "assigned_to", "due_date"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    deal_room_id = Column(Integer, ForeignKey("deal_rooms.id"), nullable=False)
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    status = Column(Enum(TaskStatus), default=TaskStatus.PENDING, nullable=False)
-    priority = Column(String(20), default="medium", nullable=False)  # low, medium, high, urgent
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    deal_room_id: Mapped[int] = mapped_column(Integer, ForeignKey("deal_rooms.id"), nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    status: Mapped[TaskStatus] = mapped_column(EnumType(TaskStatus), default=TaskStatus.PENDING, nullable=False)
+    priority: Mapped[str] = mapped_column(String(20), default="medium", nullable=False)  # low, medium, high, urgent
     
     # Assignment and tracking
-    assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
-    due_date = Column(DateTime, nullable=True)
-    completed_at = Column(DateTime, nullable=True)
+    assigned_to: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)
+    created_by: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    due_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Task metadata
-    task_type = Column(String(100), nullable=True)  # document_review, financial_analysis, etc.
-    estimated_hours = Column(Integer, nullable=True)
-    actual_hours = Column(Integer, nullable=True)
-    dependencies = Column(JSON, nullable=True)  # List of task IDs this depends on
+    task_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # document_review, financial_analysis, etc.
+    estimated_hours: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    actual_hours: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    dependencies: Mapped[Any] = mapped_column(JSON, nullable=True)  # List of task IDs this depends on
+    dependency_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # len(dependencies), kept in sync on flush
     
     # AI assistance
-    ai_generated = Column(Boolean, default=False, nullable=False)
-    ai_suggestions = Column(JSON, nullable=True)
-    automation_enabled = Column(Boolean, default=False, nullable=False)
+    ai_generated: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    ai_suggestions: Mapped[Any] = mapped_column(JSON, nullable=True)
+    automation_enabled: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    deal_room = relationship("DealRoom", back_populates="tasks")
-    assigned_user = relationship("User")
-    created_user = relationship("User")
+    deal_room: Mapped["DealRoom"] = relationship("DealRoom", back_populates="tasks")
+    assigned_user: Mapped[Optional["User"]] = relationship("User", foreign_keys=[assigned_to], lazy="joined")
+    created_user: Mapped["User"] = relationship("User", foreign_keys=[created_by], lazy="joined")
     
     def __repr__(self):
         return f"<DealRoomTask(id={self.id}, title='{self.title}', status='{self.status}')>"
     
-    @property
-    def is_overdue(self) -> bool:
-        """Check if task is overdue"""
+    def is_overdue(self, now: Optional[datetime] = None) -> bool:
+        """Check if task is overdue (pass now to reuse one timestamp across many tasks)"""
         if self.due_date and self.status != TaskStatus.COMPLETED:
-            return datetime.utcnow() > self.due_date
+            return (now or datetime.utcnow()) > self.due_date
         return False
     
     @property
@@ -152,28 +164,68 @@ class DealRoomTask(Base):
         """Check if task is completed"""
         return self.status == TaskStatus.COMPLETED
     
-    def to_dict(self) -> dict:
+    @classmethod
+    async def bulk_create(cls, session: AsyncSession, rows: List[dict]) -> None:
+        """Insert many tasks from plain dicts in one executemany (no unit of work)"""
+        if not rows:
+            return
+        # Flush events don't fire for bulk inserts, so fill the denormalized count here
+        await session.execute(
+            insert(cls),
+            [{**row, "dependency_count": len(row.get("dependencies") or [])} for row in rows]
+        )
+    
+    @classmethod
+    async def list_as_json(cls, session: AsyncSession, deal_room_id: int) -> str:
+        """Get a deal room's tasks as a JSON array string built by Postgres"""
+        rows = select(
+            cls.id,
+            cls.deal_room_id,
+            cls.title,
+            cls.description,
+            cls.status,
+            cls.priority,
+            cls.assigned_to,
+            cls.created_by,
+            cls.due_date,
+            cls.completed_at,
+            cls.task_type,
+            cls.estimated_hours,
+            cls.actual_hours,
+            func.coalesce(and_(
+                cls.due_date < func.timezone("UTC", func.now()),
+                cls.status != TaskStatus.COMPLETED
+            ), False).label("is_overdue"),
+            (cls.status == TaskStatus.COMPLETED).label("is_completed"),
+            cls.ai_generated,
+            cls.automation_enabled,
+            cls.created_at,
+            cls.updated_at
+        ).where(cls.deal_room_id == deal_room_id).subquery("t")
+        return await fetch_json_array(session, rows)
+    
+    def to_dict(self, now: Optional[datetime] = None) -> dict:
         """Convert task to dictionary"""
         return {
             "id": self.id,
             "deal_room_id": self.deal_room_id,
             "title": self.title,
             "description": self.description,
-            "status": self.status.value,
+            "status": self.status,
             "priority": self.priority,
             "assigned_to": self.assigned_to,
             "created_by": self.created_by,
-            "due_date": self.due_date.isoformat() if self.due_date else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "due_date": self.due_date,
+            "completed_at": self.completed_at,
             "task_type": self.task_type,
             "estimated_hours": self.estimated_hours,
             "actual_hours": self.actual_hours,
-            "is_overdue": self.is_overdue,
+            "is_overdue": self.is_overdue(now),
             "is_completed": self.is_completed,
             "ai_generated": self.ai_generated,
             "automation_enabled": self.automation_enabled,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
         }
 
 
@@ -181,36 +233,65 @@ class DealRoomDocument(Base):
     """Document model for deal room file management"""
     __tablename__ = "deal_room_documents"
     
-    id = Column(Integer, primary_key=True, index=True)
-    deal_room_id = Column(Integer, ForeignKey("deal_rooms.id"), nullable=False)
-    document_id = Column(Integer, ForeignKey("documents.id"), nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    deal_room_id: Mapped[int] = mapped_column(Integer, ForeignKey("deal_rooms.id"), nullable=False)
+    document_id: Mapped[int] = mapped_column(Integer, ForeignKey("documents.id"), nullable=False)
     
     # Deal room specific metadata
-    folder_path = Column(String(500), nullable=True)  # Virtual folder structure
-    tags = Column(JSON, nullable=True)  # Document tags for organization
-    version = Column(Integer, default=1, nullable=False)
-    is_latest = Column(Boolean, default=True, nullable=False)
+    folder_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)  # Virtual folder structure
+    tags: Mapped[Any] = mapped_column(JSON, nullable=True)  # Document tags for organization
+    version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    is_latest: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     
     # Collaboration features
-    shared_with = Column(JSON, nullable=True)  # List of user IDs with access
-    comments = Column(JSON, nullable=True)  # Document-specific comments
-    review_status = Column(String(50), nullable=True)  # pending, approved, rejected
+    shared_with: Mapped[Any] = mapped_column(JSON, nullable=True)  # List of user IDs with access
+    shared_with_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # len(shared_with), kept in sync on flush
+    review_status: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)  # pending, approved, rejected
     
     # AI processing
-    ai_analysis = Column(JSON, nullable=True)  # AI-generated document insights
-    auto_tags = Column(JSON, nullable=True)  # AI-generated tags
+    ai_analysis: Mapped[Any] = mapped_column(JSON, nullable=True)  # AI-generated document insights
+    auto_tags: Mapped[Any] = mapped_column(JSON, nullable=True)  # AI-generated tags
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
-    deal_room = relationship("DealRoom", back_populates="documents")
-    document = relationship("Document")
+    deal_room: Mapped["DealRoom"] = relationship("DealRoom", back_populates="documents")
+    document: Mapped["Document"] = relationship("Document")
     
     def __repr__(self):
         return f"<DealRoomDocument(id={self.id}, document_id={self.document_id})>"
     
+    @classmethod
+    async def bulk_create(cls, session: AsyncSession, rows: List[dict]) -> None:
+        """Insert many documents from plain dicts in one executemany (no unit of work)"""
+        if not rows:
+            return
+        # Flush events don't fire for bulk inserts, so fill the denormalized count here
+        await session.execute(
+            insert(cls),
+            [{**row, "shared_with_count": len(row.get("shared_with") or [])} for row in rows]
+        )
+    
+    @classmethod
+    async def list_as_json(cls, session: AsyncSession, deal_room_id: int) -> str:
+        """Get a deal room's documents as a JSON array string built by Postgres"""
+        rows = select(
+            cls.id,
+            cls.deal_room_id,
+            cls.document_id,
+            cls.folder_path,
+            cls.tags,
+            cls.version,
+            cls.is_latest,
+            cls.shared_with,
+            cls.review_status,
+            cls.created_at,
+            cls.updated_at
+        ).where(cls.deal_room_id == deal_room_id).subquery("t")
+        return await fetch_json_array(session, rows)
+    
     def to_dict(self) -> dict:
         """Convert deal room document to dictionary"""
         return {
@@ -223,6 +304,72 @@ class DealRoomDocument(Base):
             "is_latest": self.is_latest,
             "shared_with": self.shared_with,
             "review_status": self.review_status,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        } 
\ No newline at end of file
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+
+class DealRoomActivity(Base):
+    """Activity timeline entry for a deal room"""
+    __tablename__ = "deal_room_activities"
+    __table_args__ = (
+        Index("ix_deal_room_activities_room_created", "deal_room_id", "created_at"),
+    )
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    deal_room_id: Mapped[int] = mapped_column(Integer, ForeignKey("deal_rooms.id"), nullable=False)
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("users.id"), nullable=True)  # None for system/AI events
+    action: Mapped[str] = mapped_column(String(100), nullable=False)  # task_completed, document_uploaded, etc.
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    details: Mapped[Any] = mapped_column(JSONB, nullable=True)  # Small event-specific payload
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    
+    # Relationships
+    deal_room: Mapped["DealRoom"] = relationship("DealRoom", back_populates="activities")
+    
+    def __repr__(self):
+        return f"<DealRoomActivity(id={self.id}, deal_room_id={self.deal_room_id}, action='{self.action}')>"
+    
+    @classmethod
+    async def recent(cls, session: AsyncSession, deal_room_id: int, limit: int = 50) -> List["DealRoomActivity"]:
+        """Get a deal room's latest activity entries, newest first"""
+        result = await session.execute(
+            select(cls)
+            .where(cls.deal_room_id == deal_room_id)
+            .order_by(cls.created_at.desc(), cls.id.desc())
+            .limit(limit)
+        )
+        return list(result.scalars())
+    
+    def to_dict(self) -> dict:
+        """Convert activity entry to dictionary"""
+        return {
+            "id": self.id,
+            "deal_room_id": self.deal_room_id,
+            "user_id": self.user_id,
+            "action": self.action,
+            "description": self.description,
+            "details": self.details,
+            "created_at": self.created_at
+        }
+
+
+# Keep denormalized counts in sync with their JSON lists so reads never parse JSON
+@event.listens_for(DealRoom, "before_insert")
+@event.listens_for(DealRoom, "before_update")
+def _sync_team_size(mapper, connection, target: DealRoom) -> None:
+    target.team_size = len(target.team_members or [])
+
+
+@event.listens_for(DealRoomTask, "before_insert")
+@event.listens_for(DealRoomTask, "before_update")
+def _sync_dependency_count(mapper, connection, target: DealRoomTask) -> None:
+    target.dependency_count = len(target.dependencies or [])
+
+
+@event.listens_for(DealRoomDocument, "before_insert")
+@event.listens_for(DealRoomDocument, "before_update")
+def _sync_shared_with_count(mapper, connection, target: DealRoomDocument) -> None:
+    target.shared_with_count = len(target.shared_with or [])
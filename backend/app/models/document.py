@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum, ForeignKey, Float
+from sqlalchemy import Integer, BigInteger, String, Boolean, DateTime, Text, ForeignKey, Float, Index, select, cast
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
-from app.core.database import Base
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
+from app.core.database import Base, EnumType, fetch_json_array
 import enum
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from app.models.deal import Deal
+    from app.models.user import User
 
 
 class DocumentType(str, enum.Enum):
@@ -28,55 +34,70 @@ class DocumentStatus(str, enum.Enum):
     ARCHIVED = "archived"
 
 
+# Document types treated as financial
+_FINANCIAL_DOCS = frozenset({DocumentType.FINANCIAL_STATEMENT, DocumentType.DUE_DILIGENCE})
+
+
 class Document(Base):
     """Document model for managing uploaded files and processing"""
     __tablename__ = "documents"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    filename = Column(String(255), nullable=False)
-    original_filename = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)  # S3 path
-    file_size = Column(Integer, nullable=False)  # in bytes
-    content_type = Column(String(100), nullable=False)
-    document_type = Column(Enum(DocumentType), nullable=False)
-    status = Column(Enum(DocumentStatus), default=DocumentStatus.UPLOADED, nullable=False)
+    __table_args__ = (
+        Index("ix_documents_deal_status", "deal_id", "status"),
+        Index("ix_documents_deal_type", "deal_id", "document_type"),
+        Index("ix_documents_risk_flags_gin", "risk_flags", postgresql_using="gin"),
+    )
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    original_filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    file_path: Mapped[str] = mapped_column(String(500), nullable=False)  # S3 path
+    file_size: Mapped[int] = mapped_column(BigInteger, nullable=False)  # in bytes
+    file_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # SHA-256 hex digest
+    content_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    document_type: Mapped[DocumentType] = mapped_column(EnumType(DocumentType), nullable=False)
+    status: Mapped[DocumentStatus] = mapped_column(EnumType(DocumentStatus), default=DocumentStatus.UPLOADED, nullable=False)
     
     # Deal association
-    deal_id = Column(Integer, ForeignKey("deals.id"), nullable=False)
-    uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    deal_id: Mapped[int] = mapped_column(Integer, ForeignKey("deals.id"), nullable=False)
+    uploaded_by: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Processing metadata
-    processing_started = Column(DateTime, nullable=True)
-    processing_completed = Column(DateTime, nullable=True)
-    processing_errors = Column(Text, nullable=True)
-    processing_score = Column(Float, nullable=True)  # AI confidence score
+    processing_started: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    processing_completed: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    processing_errors: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    processing_score: Mapped[Optional[float]] = mapped_column(Float(precision=24), nullable=True)  # AI confidence score
     
     # OCR and NLP results
-    extracted_text = Column(Text, nullable=True)
-    ocr_confidence = Column(Float, nullable=True)
-    nlp_analysis = Column(Text, nullable=True)  # JSON string of NLP results
+    # Large analysis blobs are deferred; load them with undefer_group("analysis")
+    extracted_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group="analysis")
+    ocr_confidence: Mapped[Optional[float]] = mapped_column(Float(precision=24), nullable=True)
+    nlp_analysis: Mapped[Any] = mapped_column(JSONB, nullable=True, deferred=True, deferred_group="analysis")  # NLP results
     
     # Risk analysis
-    risk_flags = Column(Text, nullable=True)  # JSON string of risk flags
-    risk_score = Column(Float, nullable=True)  # Overall risk score
-    risk_summary = Column(Text, nullable=True)
+    risk_flags: Mapped[Any] = mapped_column(JSONB, nullable=True, deferred=True, deferred_group="analysis")  # Risk flags
+    risk_score: Mapped[Optional[float]] = mapped_column(Float(precision=24), nullable=True)  # Overall risk score
+    risk_summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Financial data extraction
-    financial_metrics = Column(Text, nullable=True)  # JSON string of financial data
-    key_findings = Column(Text, nullable=True)
+    financial_metrics: Mapped[Any] = mapped_column(JSONB, nullable=True, deferred=True, deferred_group="analysis")  # Extracted financial data
+    key_findings: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True, deferred_group="analysis")
     
     # Security and compliance
-    is_encrypted = Column(Boolean, default=True, nullable=False)
-    encryption_key_id = Column(String(100), nullable=True)
-    retention_date = Column(DateTime, nullable=True)
+    is_encrypted: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    encryption_key_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    retention_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Computed in the SELECT so serializers just read it
+    is_financial_document: Mapped[bool] = column_property(document_type.in_(sorted(_FINANCIAL_DOCS)))
     
     # Relationships
-    deal = relationship("Deal", back_populates="documents")
-    uploaded_by_user = relationship("User", back_populates="documents")
+    # Lazy by default; list queries use raiseload("*"), so load these with joinedload()
+    deal: Mapped["Deal"] = relationship("Deal", back_populates="documents")
+    uploaded_by_user: Mapped["User"] = relationship("User", back_populates="documents")
     
     def __repr__(self):
         return f"<Document(id={self.id}, filename='{self.filename}', type='{self.document_type}', status='{self.status}')>"
@@ -103,13 +124,41 @@ class Document(Base):
         """Get file size in MB"""
         return self.file_size / (1024 * 1024)
     
-    @property
-    def is_financial_document(self) -> bool:
-        """Check if document is financial in nature"""
-        return self.document_type in [
-            DocumentType.FINANCIAL_STATEMENT,
-            DocumentType.DUE_DILIGENCE
-        ]
+    @classmethod
+    def list_columns(cls) -> tuple:
+        """Core projection for document lists, keyed like to_dict() (derived fields computed in SQL)"""
+        return (
+            cls.id,
+            cls.filename,
+            cls.original_filename,
+            cls.file_size,
+            (cast(cls.file_size, Float) / (1024 * 1024)).label("file_size_mb"),
+            cls.content_type,
+            cls.document_type,
+            cls.status,
+            cls.deal_id,
+            cls.uploaded_by,
+            cls.processing_started,
+            cls.processing_completed,
+            cast(
+                func.extract("epoch", cls.processing_completed - cls.processing_started), Float
+            ).label("processing_time"),
+            cls.processing_score,
+            cls.ocr_confidence,
+            cls.risk_score,
+            cls.risk_summary,
+            (cls.status == DocumentStatus.PROCESSED).label("is_processed"),
+            (cls.status == DocumentStatus.FAILED).label("is_failed"),
+            cls.is_financial_document.label("is_financial_document"),
+            cls.created_at,
+            cls.updated_at
+        )
+    
+    @classmethod
+    async def list_as_json(cls, session: AsyncSession, deal_id: int) -> str:
+        """Get a deal's documents as a JSON array string built by Postgres"""
+        rows = select(*cls.list_columns()).where(cls.deal_id == deal_id).subquery("t")
+        return await fetch_json_array(session, rows)
     
     def to_dict(self) -> dict:
         """Convert document to dictionary"""
@@ -120,12 +169,12 @@ class Document(Base):
             "file_size": self.file_size,
             "file_size_mb": self.file_size_mb,
             "content_type": self.content_type,
-            "document_type": self.document_type.value,
-            "status": self.status.value,
+            "document_type": self.document_type,
+            "status": self.status,
             "deal_id": self.deal_id,
             "uploaded_by": self.uploaded_by,
-            "processing_started": self.processing_started.isoformat() if self.processing_started else None,
-            "processing_completed": self.processing_completed.isoformat() if self.processing_completed else None,
+            "processing_started": self.processing_started,
+            "processing_completed": self.processing_completed,
             "processing_time": self.processing_time,
             "processing_score": self.processing_score,
             "ocr_confidence": self.ocr_confidence,
@@ -134,6 +183,6 @@ class Document(Base):
             "is_processed": self.is_processed,
             "is_failed": self.is_failed,
             "is_financial_document": self.is_financial_document,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
         } 
\ No newline at end of file
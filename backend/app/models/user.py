@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Enum
+from sqlalchemy import Integer, String, Boolean, DateTime, Text, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
-from app.core.database import Base
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
+from app.core.database import Base, EnumType, RowView
+from dataclasses import dataclass
 import enum
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, List
+
+if TYPE_CHECKING:
+    from app.models.deal import Deal
+    from app.models.document import Document
 
 
 class UserRole(str, enum.Enum):
@@ -23,57 +28,62 @@ class UserStatus(str, enum.Enum):
     PENDING = "pending"
 
 
+# Roles with manager-level access
+MANAGER_ROLES = frozenset({UserRole.ADMIN, UserRole.MANAGER})
+
+
 class User(Base):
     """User model for authentication and authorization"""
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_role_status_id", "role", "status", "id"),
+        Index("ix_users_status_created_at", "status", "created_at"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String(255), unique=True, index=True, nullable=False)
-    username = Column(String(100), unique=True, index=True, nullable=False)
-    hashed_password = Column(String(255), nullable=False)
-    first_name = Column(String(100), nullable=True)
-    last_name = Column(String(100), nullable=True)
-    role = Column(Enum(UserRole), default=UserRole.ANALYST, nullable=False)
-    status = Column(Enum(UserStatus), default=UserStatus.PENDING, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
+    username: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
+    hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
+    first_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    role: Mapped[UserRole] = mapped_column(EnumType(UserRole), default=UserRole.ANALYST, nullable=False)
+    status: Mapped[UserStatus] = mapped_column(EnumType(UserStatus), default=UserStatus.PENDING, nullable=False)
     
     # Company information
-    company_name = Column(String(255), nullable=True)
-    company_size = Column(String(50), nullable=True)
-    job_title = Column(String(100), nullable=True)
+    company_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    company_size: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    job_title: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     
     # Contact information
-    phone = Column(String(20), nullable=True)
-    address = Column(Text, nullable=True)
+    phone: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+    address: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Security and preferences
-    is_active = Column(Boolean, default=True, nullable=False)
-    is_verified = Column(Boolean, default=False, nullable=False)
-    two_factor_enabled = Column(Boolean, default=False, nullable=False)
-    last_login = Column(DateTime, nullable=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    is_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    two_factor_enabled: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    last_login: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=func.now(), nullable=False)
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Computed in the SELECT: "first last", whichever name is set, else username
+    full_name: Mapped[str] = column_property(
+        func.coalesce(
+            func.nullif(func.concat_ws(" ", func.nullif(first_name, ""), func.nullif(last_name, "")), ""),
+            username
+        )
+    )
     
     # Relationships
-    deals = relationship("Deal", back_populates="created_by_user")
-    documents = relationship("Document", back_populates="uploaded_by_user")
+    # Lazy by default; list queries use raiseload("*"), so load these with selectinload()
+    deals: Mapped[List["Deal"]] = relationship("Deal", back_populates="created_by_user")
+    documents: Mapped[List["Document"]] = relationship("Document", back_populates="uploaded_by_user")
     
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}', role='{self.role}')>"
     
-    @property
-    def full_name(self) -> str:
-        """Get user's full name"""
-        if self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
-        elif self.first_name:
-            return self.first_name
-        elif self.last_name:
-            return self.last_name
-        else:
-            return self.username
-    
     @property
     def is_admin(self) -> bool:
         """Check if user is admin"""
@@ -82,13 +92,11 @@ class User(Base):
     @property
     def is_manager(self) -> bool:
         """Check if user is manager or admin"""
-        return self.role in [UserRole.ADMIN, UserRole.MANAGER]
+        return self.role in MANAGER_ROLES
     
     def can_access_deal(self, deal_user_id: int) -> bool:
-        """Check if user can access a specific deal"""
-        if self.is_admin or self.is_manager:
-            return True
-        return self.id == deal_user_id
+        """Check if user can access a specific deal (in-memory, no queries)"""
+        return self.is_manager or self.id == deal_user_id
     
     def to_dict(self) -> dict:
         """Convert user to dictionary"""
@@ -98,14 +106,33 @@ class User(Base):
             "username": self.username,
             "first_name": self.first_name,
             "last_name": self.last_name,
-            "role": self.role.value,
-            "status": self.status.value,
+            "role": self.role,
+            "status": self.status,
             "company_name": self.company_name,
             "company_size": self.company_size,
             "job_title": self.job_title,
             "is_active": self.is_active,
             "is_verified": self.is_verified,
-            "last_login": self.last_login.isoformat() if self.last_login else None,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        } 
\ No newline at end of file
+            "last_login": self.last_login,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class UserView(RowView):
+    """Read-only user row for serialization paths that skip ORM instances"""
+    __model__ = User
+    
+    id: int
+    email: str
+    username: str
+    first_name: Optional[str]
+    last_name: Optional[str]
+    role: UserRole
+    status: UserStatus
+    company_name: Optional[str]
+    job_title: Optional[str]
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
@@ -0,0 +1,73 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+
+from app.models.collaboration import CommentType, TemplateType
+
+
+class CommentResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    deal_room_id: int
+    document_id: Optional[int]
+    task_id: Optional[int]
+    content: str
+    comment_type: CommentType
+    parent_comment_id: Optional[int]
+    author_id: int
+    is_ai_generated: bool
+    ai_confidence: Optional[int]
+    mentions: Optional[List[int]]
+    tags: Optional[List[str]]
+    is_resolved: bool
+    resolved_by: Optional[int]
+    resolved_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
+
+
+class KnowledgeTemplateResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    name: str
+    description: Optional[str]
+    template_type: TemplateType
+    content: Dict[str, Any]
+    variables: Optional[Any]
+    created_by: int
+    company_id: Optional[int]
+    is_public: bool
+    is_approved: bool
+    usage_count: int
+    success_rate: Optional[int]
+    average_rating: Optional[int]
+    tags: Optional[List[str]]
+    industry: Optional[str]
+    deal_type: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+class LearningInsightResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: int
+    title: str
+    description: Optional[str]
+    insight_type: str
+    data: Dict[str, Any]
+    recommendations: Optional[Any]
+    impact_score: Optional[int]
+    source_deal_room_id: Optional[int]
+    source_company_id: Optional[int]
+    is_ai_generated: bool
+    is_implemented: bool
+    implementation_date: Optional[datetime]
+    implementation_results: Optional[Any]
+    is_shared: bool
+    shared_companies: Optional[List[int]]
+    feedback: Optional[Any]
+    created_at: datetime
+    updated_at: datetime